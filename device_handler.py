@@ -4,8 +4,9 @@ Device Handler Interface for Subnet Scanner
 This module provides the base interface for device handlers,
 which implement device-specific operations like log fetching and parsing.
 """
+import re
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 from device_registry import DeviceRegistry
 
 
@@ -16,6 +17,9 @@ class DeviceHandler(ABC):
     """
     device_type = None
     
+    # Timestamped text log line, e.g. "2025-06-20 09:00:00 message"
+    _TIMESTAMP_RE = re.compile(r"(\d{4}-\d{2}-\d{2})\s+(\d{2}:\d{2}:\d{2})\s+(.*)")
+    
     def __init__(self, scanner, model_config=None):
         """
         Initialize the handler with a reference to the scanner and model configuration
@@ -63,6 +67,87 @@ class DeviceHandler(ABC):
         """
         pass
         
+    @staticmethod
+    def tail_log_lines(log_content: bytes, count: int = 1) -> List[str]:
+        """
+        Extract the last lines of a raw log payload without decoding all of it
+        
+        Args:
+            log_content: Raw log content as bytes
+            count: Maximum number of lines to return
+            
+        Returns:
+            Up to `count` decoded log lines, oldest first
+        """
+        buf = log_content.strip()
+        end = len(buf)
+        lines = []
+        
+        # Walk backwards from the end, decoding only the lines we keep
+        while end > 0 and len(lines) < count:
+            start = buf.rfind(b"\n", 0, end) + 1
+            line = buf[start:end].decode("utf-8", "replace")
+            lines.append(line)
+            end = start - 1
+        
+        lines.reverse()
+        return lines
+    
+    @staticmethod
+    def iter_lines_reversed(text: str) -> Iterator[str]:
+        """
+        Iterate over the lines of a log, most recent (last) first
+        
+        Yields the same lines as reversed(text.strip().split("\n")) without
+        building the list, so callers that stop early never touch older lines.
+        
+        Args:
+            text: Decoded log content
+            
+        Yields:
+            Log lines from last to first
+        """
+        start, end = 0, len(text)
+        while end > start and text[end - 1].isspace():
+            end -= 1
+        while start < end and text[start].isspace():
+            start += 1
+        
+        while True:
+            newline = text.rfind("\n", start, end)
+            if newline < 0:
+                yield text[start:end]
+                return
+            yield text[newline + 1:end]
+            end = newline
+    
+    @classmethod
+    def split_timestamp(cls, line: str) -> Optional[Tuple[str, str, str]]:
+        """
+        Split a "YYYY-MM-DD HH:MM:SS message" log line into its parts
+        
+        Well-formed lines are split by hand; anything else falls back to
+        _TIMESTAMP_RE, which also finds timestamps that are not at the start.
+        
+        Args:
+            line: Single decoded log line
+            
+        Returns:
+            Tuple of (date, time, message), or None if no timestamp is found
+        """
+        parts = line.split(" ", 2)
+        if len(parts) == 3:
+            date, time, message = parts
+            if (len(date) == 10 and date[4] == "-" and date[7] == "-"
+                    and len(time) == 8 and time[2] == ":" and time[5] == ":"
+                    and (date[:4] + date[5:7] + date[8:] + time[:2] + time[3:5] + time[6:]).isdigit()):
+                return date, time, message.lstrip()
+        
+        timestamp_match = cls._TIMESTAMP_RE.search(line)
+        if timestamp_match:
+            return timestamp_match.group(1), timestamp_match.group(2), timestamp_match.group(3)
+        return None
+    
     def normalize_message(self, message: str) -> str:
         """
         Normalize error messages for consistent grouping
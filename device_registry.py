@@ -4,6 +4,7 @@ Device Registry for Subnet Scanner
 This module provides a registry for device type detectors and handlers,
 allowing for a flexible plugin architecture to support multiple device types.
 """
+import re
 from typing import Dict, Any, Callable, Type
 
 
@@ -15,6 +16,20 @@ class DeviceRegistry:
     _detectors = {}
     _handlers = {}
     
+    # Model number in a full device type string, e.g. "Antminer S19j Pro" -> "S19"
+    _ANTMINER_RE = re.compile(r'Antminer\s+([A-Z]\d+\+*)')
+    
+    # Model tokens that normalize to a fixed name; more specific tokens come first
+    _MAIN_TYPES = {
+        "Z15j": "Z15j",
+        "Z15": "Z15",
+        "T21": "T21",
+        "S21 Pro": "S21 Pro",
+        "S21Pro": "S21 Pro",
+        "S21+": "S21+",
+    }
+    _MAIN_TYPE_RE = re.compile("|".join(map(re.escape, _MAIN_TYPES)))
+    
     @classmethod
     def register_detector(cls, device_type: str, detector_func: Callable):
         """
@@ -91,24 +106,16 @@ class DeviceRegistry:
         if device_type == "unknown":
             return "unknown"
             
-        # Extract the main model from full device type string
-        # Check for specific device types first (more specific before less specific)
-        if "Z15j" in device_type:
-            return "Z15j"
-        elif "Z15" in device_type:
-            return "Z15"
-        elif "T21" in device_type:
-            return "T21"
-        elif "S21 Pro" in device_type or "S21Pro" in device_type:  # For S21 Pro devices
-            return "S21 Pro"
-        elif "S21+" in device_type:  # For S21+ devices
-            return "S21+"
+        # Extract the main model from full device type string with a single scan
+        # for the known model tokens
+        main_match = cls._MAIN_TYPE_RE.search(device_type)
+        if main_match:
+            return cls._MAIN_TYPES[main_match.group(0)]
+        
+        # For any other models, extract the model number (e.g., Antminer XXX -> XXX)
+        model_match = cls._ANTMINER_RE.search(device_type)
+        if model_match:
+            return model_match.group(1)
         else:
-            # For any other models, extract the model number (e.g., Antminer XXX -> XXX)
-            import re
-            model_match = re.search(r'Antminer\s+([A-Z]\d+[\+]*)', device_type)
-            if model_match:
-                return model_match.group(1)
-            else:
-                # Use the full string if we can't extract a specific model
-                return device_type
+            # Use the full string if we can't extract a specific model
+            return device_type
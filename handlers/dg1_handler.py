@@ -8,16 +8,24 @@ import re
 import json
 import requests
 from typing import Dict, Any, List
-from requests.auth import HTTPDigestAuth
 
 from device_handler import DeviceHandler
 from device_registry import DeviceRegistry
+from http_client import get_digest_auth, get_session
 
 
 class DG1Handler(DeviceHandler):
     """Handler for DG1+ devices"""
     device_type = "DG1+"
     
+    # Only the most recent log lines are parsed, so request just the tail of the log
+    LOG_TAIL_BYTES = 8192
+    
+    # Variable parts of a log message replaced during normalization
+    _IP_ADDRESS_RE = re.compile(r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}')
+    _DATE_RE = re.compile(r'\d{4}-\d{2}-\d{2}')
+    _TIME_RE = re.compile(r'\d{2}:\d{2}:\d{2}')
+    
     def get_log_endpoint(self) -> str:
         """Return the log endpoint for DG1+ devices"""
         return "/cgi-bin/hlog.cgi"
@@ -44,9 +52,9 @@ class DG1Handler(DeviceHandler):
         try:
             # Try to get system info
             info_url = f"http://{ip}{cls.get_info_endpoint()}"
-            auth = HTTPDigestAuth(username, password)
+            auth = get_digest_auth(username, password)
             
-            response = requests.get(info_url, auth=auth, timeout=timeout, verify=False)
+            response = get_session().get(info_url, auth=auth, timeout=timeout)
             
             if response.status_code == 200:
                 # Try to parse JSON response
@@ -66,6 +74,9 @@ class DG1Handler(DeviceHandler):
         """
         Fetch logs from DG1+ device using HTTP with special headers
         
+        Only the last LOG_TAIL_BYTES of the log are requested with a Range header;
+        devices that ignore it return the full log, which is handled the same way.
+        
         Args:
             ip: IP address of the device
             
@@ -73,20 +84,33 @@ class DG1Handler(DeviceHandler):
             Dictionary with log information
         """
         url = f"http://{ip}{self.get_log_endpoint()}"
-        auth = HTTPDigestAuth(self.scanner.username, self.scanner.password)
+        auth = get_digest_auth(self.scanner.username, self.scanner.password)
         
         try:
             # Add specific headers for request
             headers = {
                 'Accept': 'text/plain, */*; q=0.01',
-                'X-Requested-With': 'XMLHttpRequest'
+                'X-Requested-With': 'XMLHttpRequest',
+                'Range': f'bytes=-{self.LOG_TAIL_BYTES}'
             }
             
             # Fetch logs
-            response = requests.get(url, auth=auth, headers=headers, timeout=self.scanner.timeout, verify=False)
+            response = get_session().get(url, auth=auth, headers=headers, timeout=self.scanner.timeout)
             
-            if response.status_code == 200:
-                return self.parse_logs(response.text, ip)
+            if response.status_code == 416:
+                # Range not satisfiable (e.g. empty log), retry for the whole log
+                del headers['Range']
+                response = get_session().get(url, auth=auth, headers=headers, timeout=self.scanner.timeout)
+            
+            if response.status_code == 206:
+                log_content = response.content
+                # The first line is most likely cut off unless the range starts at
+                # the beginning of the log (short logs come back whole, e.g. "bytes 0-33/34")
+                if not response.headers.get('Content-Range', '').startswith('bytes 0-'):
+                    log_content = log_content[log_content.find(b"\n") + 1:]
+                return self.parse_logs(log_content, ip)
+            elif response.status_code == 200:
+                return self.parse_logs(response.content, ip)
             else:
                 return {
                     "ip": ip,
@@ -101,19 +125,19 @@ class DG1Handler(DeviceHandler):
                 "message": f"Request exception for DG1+ logs: {str(e)}"
             }
     
-    def parse_logs(self, log_content: str, ip: str) -> Dict[str, Any]:
+    def parse_logs(self, log_content: bytes, ip: str) -> Dict[str, Any]:
         """
         Parse DG1+ log format
         
         Args:
-            log_content: Raw log content as string
+            log_content: Raw log content as bytes
             ip: IP address of the device
             
         Returns:
             Dictionary with parsed log information
         """
-        # Extract log lines
-        log_lines = log_content.strip().split("\n")
+        # Extract only the 10 most recent log lines
+        log_lines = self.tail_log_lines(log_content, 10)
         if not log_lines:
             return {
                 "ip": ip,
@@ -124,17 +148,15 @@ class DG1Handler(DeviceHandler):
         # Get the last (most recent) log line
         last_log_line = log_lines[-1]
         
-        # Try to parse log components with regex
+        # Try to parse log components
         date_part = ""
         time_part = ""
         message = last_log_line
         
         # Try to extract timestamp if present (format may vary)
-        timestamp_match = re.search(r"(\d{4}-\d{2}-\d{2})\s+(\d{2}:\d{2}:\d{2})\s+(.*)", last_log_line)
-        if timestamp_match:
-            date_part = timestamp_match.group(1)
-            time_part = timestamp_match.group(2)
-            message = timestamp_match.group(3)
+        timestamp_parts = self.split_timestamp(last_log_line)
+        if timestamp_parts:
+            date_part, time_part, message = timestamp_parts
         
         return {
             "ip": ip,
@@ -145,7 +167,7 @@ class DG1Handler(DeviceHandler):
             "time": time_part,
             "message": message,
             "raw_log": last_log_line,
-            "logs": log_lines[-10:] if len(log_lines) > 10 else log_lines  # Store up to 10 most recent logs
+            "logs": log_lines  # Up to 10 most recent logs
         }
     
     def normalize_message(self, message: str) -> str:
@@ -159,9 +181,9 @@ class DG1Handler(DeviceHandler):
             Normalized message string
         """
         # Remove timestamps, IP addresses, and other variable parts
-        normalized = re.sub(r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}', 'IP_ADDRESS', message)
-        normalized = re.sub(r'\d{4}-\d{2}-\d{2}', 'DATE', normalized)
-        normalized = re.sub(r'\d{2}:\d{2}:\d{2}', 'TIME', normalized)
+        normalized = self._IP_ADDRESS_RE.sub('IP_ADDRESS', message)
+        normalized = self._DATE_RE.sub('DATE', normalized)
+        normalized = self._TIME_RE.sub('TIME', normalized)
         
         return normalized
 
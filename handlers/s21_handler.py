@@ -81,31 +81,29 @@ class S21Handler(SocketBasedHandler):
             
         return result
     
-    def parse_logs(self, log_content: str) -> Dict[str, Any]:
+    def parse_logs(self, log_content: bytes) -> Dict[str, Any]:
         """
         Parse S21+ log format
         
         Args:
-            log_content: Raw log content as string
+            log_content: Raw log content as bytes
             
         Returns:
             Dictionary with parsed log information
         """
-        # S21 logs format might differ, extract the most useful information
-        log_lines = log_content.strip().split("\n")
-        last_log_line = log_lines[-1] if log_lines else ""
+        # Only the most recent line is used, so avoid decoding the whole log
+        last_lines = self.tail_log_lines(log_content)
+        last_log_line = last_lines[-1] if last_lines else ""
         
-        # Try to parse log components with regex
+        # Try to parse log components
         date_part = ""
         time_part = ""
         message = last_log_line
         
         # Try to extract timestamp if present
-        timestamp_match = re.search(r"(\d{4}-\d{2}-\d{2})\s+(\d{2}:\d{2}:\d{2})\s+(.*)", last_log_line)
-        if timestamp_match:
-            date_part = timestamp_match.group(1)
-            time_part = timestamp_match.group(2)
-            message = timestamp_match.group(3)
+        timestamp_parts = self.split_timestamp(last_log_line)
+        if timestamp_parts:
+            date_part, time_part, message = timestamp_parts
         
         return {
             "status": "success",
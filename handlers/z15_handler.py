@@ -8,16 +8,19 @@ import re
 import json
 import requests
 from typing import Dict, Any, List
-from requests.auth import HTTPDigestAuth
 
 from device_handler import DeviceHandler
 from device_registry import DeviceRegistry
+from http_client import get_digest_auth, get_session
 
 
 class Z15Handler(DeviceHandler):
     """Handler for Z15 devices"""
     device_type = "Z15"
     
+    # Fan error message without the variable timestamp prefix
+    _FAN_ERROR_RE = re.compile(r'No \d+ Fan find, check again')
+    
     def get_log_endpoint(self) -> str:
         """Return the standard log endpoint for Z15 devices"""
         return "/cgi-bin/get_kernel_log.cgi"
@@ -34,13 +37,13 @@ class Z15Handler(DeviceHandler):
         """
         # Use standard log fetching for Z15
         url = f"http://{ip}{self.get_log_endpoint()}"
-        auth = HTTPDigestAuth(self.scanner.username, self.scanner.password)
+        auth = get_digest_auth(self.scanner.username, self.scanner.password)
         
         try:
-            response = requests.get(url, auth=auth, timeout=self.scanner.timeout, verify=False)
+            response = get_session().get(url, auth=auth, timeout=self.scanner.timeout)
             
             if response.status_code == 200:
-                return self.parse_logs(response.text)
+                return self.parse_logs(response.content)
             else:
                 return {
                     "ip": ip,
@@ -55,12 +58,12 @@ class Z15Handler(DeviceHandler):
                 "message": f"Request exception for Z15 logs: {str(e)}"
             }
     
-    def parse_logs(self, log_content: str) -> Dict[str, Any]:
+    def parse_logs(self, log_content: bytes) -> Dict[str, Any]:
         """
         Parse Z15 log format (JSON)
         
         Args:
-            log_content: Raw log content
+            log_content: Raw log content as bytes
             
         Returns:
             Dictionary with parsed log information
@@ -80,10 +83,10 @@ class Z15Handler(DeviceHandler):
                     "message": message,
                     "raw_log": log_data["log"]
                 }
-        except json.JSONDecodeError:
-            # If not valid JSON, try to extract useful info from text
-            lines = log_content.strip().split("\n")
-            last_line = lines[-1] if lines else ""
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            # If not valid JSON (or not even valid UTF-8), only the last line of the text is used
+            last_lines = self.tail_log_lines(log_content)
+            last_line = last_lines[-1] if last_lines else ""
             
             return {
                 "ip": "",
@@ -105,8 +108,7 @@ class Z15Handler(DeviceHandler):
         """
         # For Z15 fan errors, normalize to ignore timestamps
         if "Fan find, check again" in message:
-            import re
-            match = re.search(r'No \d+ Fan find, check again', message)
+            match = self._FAN_ERROR_RE.search(message)
             if match:
                 return match.group(0)
         
@@ -133,10 +135,10 @@ class Z15Handler(DeviceHandler):
         
         # Try system info endpoint first (Z15 devices)
         url = f"http://{ip}/cgi-bin/get_system_info.cgi"
-        auth = HTTPDigestAuth(username, password)
+        auth = get_digest_auth(username, password)
         
         try:
-            response = requests.get(url, auth=auth, timeout=timeout, verify=False)
+            response = get_session().get(url, auth=auth, timeout=timeout)
             
             if response.status_code == 200:
                 try:
@@ -6,16 +6,25 @@ import socket
 import re
 from datetime import datetime
 from typing import Dict, Any, List, Optional, Tuple
-from requests.auth import HTTPDigestAuth
 
 from device_socket_based_handler import SocketBasedHandler
 from device_registry import DeviceRegistry
+from http_client import get_digest_auth, get_session
 
 
 class Z15jHandler(SocketBasedHandler):
     """Handler for Antminer Z15j devices"""
     device_type = "Z15j"
     
+    # Fan error in a kernel log line, optionally prefixed by "cgminer[pid]:"
+    _FAN_ERROR_LINE_RE = re.compile(r'(?:.*cgminer\[\d+\]:\s*)?(No\s+\d+\s+Fan\s+find,\s+check\s+again)')
+    # Fan error in a full log message with optional date and host information
+    _FAN_ERROR_RE = re.compile(r'(?:.*(\w+\s+\d+\s+\d+:\d+:\d+).*)?(No\s+\d+\s+Fan\s+find,\s+check\s+again)')
+    # Shortened fan error message, up to the end or a "|" separator
+    _BASIC_FAN_ERROR_RE = re.compile(r'(No\s+\d+\s+Fan\s+find.*?)(?:$|\s*\|)')
+    # Adjacent JSON objects without a separating comma
+    _MISSING_COMMA_RE = re.compile(r'(\})(\{)')
+    
     def fetch_logs(self, ip: str, ignore_success: bool = True) -> Dict[str, Any]:
         """Fetch logs from Z15j device using socket"""
         try:
@@ -90,9 +99,6 @@ class Z15jHandler(SocketBasedHandler):
         Returns:
             Dictionary with log information
         """
-        import requests
-        from requests.auth import HTTPDigestAuth
-        
         try:
             # Try to get kernel logs using the same endpoint as Z15
             # Configuration should have the log_endpoint set (typically /cgi-bin/get_kernel_log.cgi)
@@ -103,9 +109,9 @@ class Z15jHandler(SocketBasedHandler):
             timeout = config.get('timeout', 15)
             
             url = f"http://{ip}{log_endpoint}"
-            response = requests.get(
+            response = get_session().get(
                 url, 
-                auth=HTTPDigestAuth(auth_user, auth_pass),
+                auth=get_digest_auth(auth_user, auth_pass),
                 timeout=timeout
             )
             
@@ -169,15 +175,21 @@ class Z15jHandler(SocketBasedHandler):
                 }
         except json.JSONDecodeError:
             # If not valid JSON, try to extract useful info from text
-            # Extract the most relevant log line
-            lines = log_content.strip().split("\n")
+            # Extract the most relevant log line in a single pass from the end:
+            # a fan error wins, otherwise the most recent kernel or error line
+            kernel_line = None
+            last_line = None
             
             # Z15j fan error messages often contain this pattern
-            for line in reversed(lines):
+            for line in self.iter_lines_reversed(log_content):
+                if last_line is None:
+                    last_line = line
+                line_lower = line.lower()
+                
                 # Шукаємо конкретно повідомлення про помилки вентиляторів у форматі "No X Fan find"
-                if "no" in line.lower() and "fan find" in line.lower():
+                if "no" in line_lower and "fan find" in line_lower:
                     # Витягуємо тільки основну частину повідомлення
-                    fan_error_match = re.search(r'(?:.*cgminer\[\d+\]:\s*)?(No\s+\d+\s+Fan\s+find,\s+check\s+again)', line)
+                    fan_error_match = self._FAN_ERROR_LINE_RE.search(line)
                     error_message = fan_error_match.group(1) if fan_error_match else line
                     
                     return {
@@ -186,20 +198,20 @@ class Z15jHandler(SocketBasedHandler):
                         "message": error_message,
                         "raw_log": log_content
                     }
+                
+                if kernel_line is None and ("kernel" in line_lower or "error" in line_lower):
+                    kernel_line = line
             
-            # If no fan error found, take the last line or a kernel message
-            for line in reversed(lines):
-                if "kernel" in line.lower() or "error" in line.lower():
-                    return {
-                        "status": "error",
-                        "source": "Z15j-http-text",
-                        "message": line,
-                        "raw_log": log_content
-                    }
+            # If no fan error found, take the most recent kernel message
+            if kernel_line is not None:
+                return {
+                    "status": "error",
+                    "source": "Z15j-http-text",
+                    "message": kernel_line,
+                    "raw_log": log_content
+                }
             
             # Fall back to last line if nothing else found
-            last_line = lines[-1] if lines else ""
-            
             return {
                 "status": "success",
                 "source": "Z15j-http-text",
@@ -269,7 +281,7 @@ class Z15jHandler(SocketBasedHandler):
             
         # Шукаємо повідомлення про вентилятори у форматі "Дата... cgminer: No X Fan find, check again"
         # Цей регулярний вираз обробляє повні логи з датою і системною інформацією
-        fan_error_match = re.search(r'(?:.*(\w+\s+\d+\s+\d+:\d+:\d+).*)?(No\s+\d+\s+Fan\s+find,\s+check\s+again)', message)
+        fan_error_match = self._FAN_ERROR_RE.search(message)
         if fan_error_match:
             # Повертаємо тільки основне повідомлення без дати, хоста тощо
             return fan_error_match.group(2)
@@ -277,7 +289,7 @@ class Z15jHandler(SocketBasedHandler):
         # Шукаємо інший формат повідомлення про помилки вентиляторів
         if "fan" in message.lower() and ("error" in message.lower() or "find" in message.lower()):
             # Спрощений формат - просто витягнемо "No X Fan find, check again"
-            basic_fan_match = re.search(r'(No\s+\d+\s+Fan\s+find.*?)(?:$|\s*\|)', message)
+            basic_fan_match = self._BASIC_FAN_ERROR_RE.search(message)
             if basic_fan_match:
                 return basic_fan_match.group(1)
                 
@@ -335,7 +347,7 @@ class Z15jHandler(SocketBasedHandler):
         """Fix malformed JSON from Z15j devices"""
         # Fix missing commas between objects in STATS array
         # Common pattern: ..."Type":"Antminer Z15j"}{"STATS":0,...
-        json_str = re.sub(r'(\})(\{)', r'\1,\2', json_str)
+        json_str = self._MISSING_COMMA_RE.sub(r'\1,\2', json_str)
         return json_str
     
     @classmethod
@@ -386,14 +398,10 @@ class Z15jHandler(SocketBasedHandler):
         Returns:
             True if the IP is likely a Z15j device based on HTTP, False otherwise
         """
-        import requests
-        from requests.auth import HTTPDigestAuth
-        import re
-        
         try:
             # Try system info endpoint (similar to Z15)
             url = f"http://{ip}/cgi-bin/get_system_info.cgi"
-            response = requests.get(url, auth=HTTPDigestAuth(username, password), timeout=timeout)
+            response = get_session().get(url, auth=get_digest_auth(username, password), timeout=timeout)
             
             if response.status_code == 200:
                 content = response.text
@@ -404,7 +412,7 @@ class Z15jHandler(SocketBasedHandler):
                     
             # Check for web interface title containing Z15j
             url = f"http://{ip}/"
-            response = requests.get(url, auth=HTTPDigestAuth(username, password), timeout=timeout)
+            response = get_session().get(url, auth=get_digest_auth(username, password), timeout=timeout)
             
             if response.status_code == 200:
                 content = response.text.lower()
@@ -0,0 +1,169 @@
+"""
+HTTP Client Helpers for Subnet Scanner
+
+This module provides HTTP objects shared by the scanners and device handlers,
+so that state negotiated with a device can be reused by later requests.
+"""
+import threading
+from typing import Dict, Tuple
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.auth import HTTPDigestAuth
+from urllib3.util.retry import Retry
+
+
+class _SharedDigestState:
+    """
+    Digest authentication state for SharedDigestAuth.
+    The server challenge and nonce counter are kept per host and shared by all
+    threads, while per-request bookkeeping (current host, body position,
+    401 counter) stays thread-local.
+    """
+    _SHARED_ATTRS = ("chal", "last_nonce", "nonce_count")
+    
+    def __init__(self):
+        object.__setattr__(self, "_local", threading.local())
+        object.__setattr__(self, "_shared", {})
+    
+    def __getattr__(self, name):
+        if name in self._SHARED_ATTRS:
+            try:
+                return self._shared[self._local.host][name]
+            except (KeyError, AttributeError):
+                raise AttributeError(name)
+        return getattr(self._local, name)
+    
+    def __setattr__(self, name, value):
+        if name in self._SHARED_ATTRS:
+            self._shared.setdefault(getattr(self._local, "host", None), {})[name] = value
+        else:
+            setattr(self._local, name, value)
+
+
+class SharedDigestAuth(HTTPDigestAuth):
+    """
+    HTTP Digest authentication that shares the negotiated nonce between threads.
+    
+    requests.auth.HTTPDigestAuth keeps a single challenge in thread-local storage,
+    so every worker thread pays the 401 challenge round-trip on its first request,
+    and again whenever it moves on to another device. Challenges are cached per
+    host here, so any later request to a host already challenged (e.g. the log
+    fetch after detection) sends the Authorization header up front.
+    """
+    
+    def __init__(self, username: str, password: str):
+        super().__init__(username, password)
+        self._thread_local = _SharedDigestState()
+        self._lock = threading.Lock()
+    
+    def __call__(self, r):
+        # Select the challenge cached for the request's host before requests uses it
+        self._thread_local.host = urlparse(r.url).netloc
+        return super().__call__(r)
+    
+    def init_per_thread_state(self):
+        """Initialize thread-local state without resetting the shared challenge"""
+        state = self._thread_local
+        if not hasattr(state, "init"):
+            state.init = True
+            state.pos = None
+            state.num_401_calls = None
+        if not hasattr(state, "chal"):
+            # First request to this host
+            with self._lock:
+                if not hasattr(state, "chal"):
+                    state.chal = {}
+                    state.last_nonce = ""
+                    state.nonce_count = 0
+    
+    def build_digest_header(self, method, url):
+        """Build the Authorization header, serializing access to the shared nonce counter"""
+        with self._lock:
+            return super().build_digest_header(method, url)
+
+
+_digest_auth_cache: Dict[Tuple[str, str], SharedDigestAuth] = {}
+_digest_auth_lock = threading.Lock()
+
+
+def get_digest_auth(username: str, password: str) -> SharedDigestAuth:
+    """
+    Get the shared digest authentication object for a set of credentials
+    
+    Args:
+        username: Username for authentication
+        password: Password for authentication
+        
+    Returns:
+        SharedDigestAuth instance reused by all callers with these credentials
+    """
+    with _digest_auth_lock:
+        auth = _digest_auth_cache.get((username, password))
+        if auth is None:
+            auth = SharedDigestAuth(username, password)
+            _digest_auth_cache[(username, password)] = auth
+        return auth
+
+
+# Default connection pool sizing: number of per-host pools kept, and idle connections kept per host
+DEFAULT_POOL_CONNECTIONS = 64
+DEFAULT_POOL_MAXSIZE = 256
+
+_session = None
+_session_lock = threading.Lock()
+_pool_size = (DEFAULT_POOL_CONNECTIONS, DEFAULT_POOL_MAXSIZE)
+
+
+def _mount_adapters(session: requests.Session) -> None:
+    """Mount pooled, non-retrying adapters sized from the current pool settings"""
+    # Close the adapters being replaced so their pooled sockets are released
+    for old_adapter in set(session.adapters.values()):
+        old_adapter.close()
+    
+    pool_connections, pool_maxsize = _pool_size
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                          max_retries=Retry(total=0))
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+
+def configure_session_pool(pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+                           pool_maxsize: int = DEFAULT_POOL_MAXSIZE) -> None:
+    """
+    Size the connection pool of the shared HTTP session
+    
+    These control how many connections are kept for reuse, not how many
+    requests may run at once; fetch_concurrency bounds that.
+    
+    Args:
+        pool_connections: Number of per-host pools kept (least recently used
+                          hosts are evicted beyond this)
+        pool_maxsize: Number of idle connections kept open per host
+    """
+    global _pool_size
+    with _session_lock:
+        if _pool_size == (pool_connections, pool_maxsize):
+            return
+        _pool_size = (pool_connections, pool_maxsize)
+        if _session is not None:
+            _mount_adapters(_session)
+
+
+def get_session() -> requests.Session:
+    """
+    Get the HTTP session shared by the scanner and device handlers
+    
+    The session keeps a connection pool per host, so a device contacted during
+    discovery can serve its log request over the same keep-alive connection.
+    
+    Returns:
+        Shared requests.Session instance
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            _mount_adapters(_session)
+        return _session
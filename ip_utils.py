@@ -0,0 +1,69 @@
+"""
+IP Utilities for Subnet Scanner
+
+This module provides helpers for expanding IP networks into lists of
+host addresses to be scanned.
+"""
+import ipaddress
+import socket
+import struct
+from typing import Iterator, List, Union
+
+
+def network_size(cidr: str) -> int:
+    """
+    Count the addresses of a network in CIDR notation from its prefix length
+    
+    Unlike ipaddress.ip_network(cidr).num_addresses, this does not build and
+    validate a network object.
+    
+    Args:
+        cidr: Network in CIDR notation (e.g. '10.0.0.0/24'); a bare address counts as one
+        
+    Returns:
+        Number of addresses in the network
+    """
+    address, _, prefix = cidr.partition("/")
+    if not prefix:
+        return 1
+    bits = 128 if ":" in address else 32
+    return 1 << (bits - int(prefix))
+
+
+def iter_network_hosts(network: Union[ipaddress.IPv4Network, ipaddress.IPv6Network]) -> Iterator[str]:
+    """
+    Iterate over the usable host addresses of a network as strings
+    
+    Addresses are produced lazily, so a large network can be consumed in
+    slices without holding every host string in memory. IPv4 networks are
+    expanded from their integer range, which avoids creating an IPv4Address
+    object per host.
+    
+    Args:
+        network: Network to expand
+        
+    Returns:
+        Iterator over host IP addresses (network and broadcast addresses excluded)
+    """
+    # /31 and /32 have special host semantics, leave them to ipaddress
+    if network.version != 4 or network.prefixlen >= 31:
+        return (str(ip) for ip in network.hosts())
+    
+    base = int(network.network_address)
+    first, last = base + 1, base + network.num_addresses - 1
+    
+    pack = struct.Struct("!I").pack
+    return map(socket.inet_ntoa, map(pack, range(first, last)))
+
+
+def network_hosts(network: Union[ipaddress.IPv4Network, ipaddress.IPv6Network]) -> List[str]:
+    """
+    List the usable host addresses of a network as strings
+    
+    Args:
+        network: Network to expand
+        
+    Returns:
+        List of host IP addresses (network and broadcast addresses excluded)
+    """
+    return list(iter_network_hosts(network))
@@ -10,13 +10,16 @@ For scanning mining sites using a hierarchical configuration structure:
 import ipaddress
 import concurrent.futures
 import requests
+import urllib3
 from requests.auth import HTTPDigestAuth
 import json
 import re
 import os
+import sys
 import argparse
 import datetime
 import time
+from collections import defaultdict
 from typing import List, Dict, Any, Optional, Union, Tuple
 
 # Try importing websocket packages
@@ -56,6 +59,17 @@ except ImportError:
 # Define if any websocket capability is available
 WEBSOCKET_AVAILABLE = WEBSOCKETS_ASYNCIO_AVAILABLE or WEBSOCKET_CLIENT_AVAILABLE
 
+# Try importing orjson for faster JSON report writing
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    print("⚠️ Orjson package not available. Install with 'pip install orjson' to enable faster JSON report writing.")
+
+# Device endpoints are plain HTTP; silence certificate warnings once instead of per request
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
 # Import device components
 from device_manager import DeviceManager
 from handlers import t21_handler
@@ -66,6 +80,8 @@ from handlers import s21_pro_handler
 from handlers import s19j_pro_handler
 from handlers import dg1_handler
 from device_registry import DeviceRegistry
+from ip_utils import network_hosts
+from http_client import DEFAULT_POOL_CONNECTIONS, DEFAULT_POOL_MAXSIZE, configure_session_pool
 
 # Ensure Z15j is checked before Z15 in device detection
 # This is critical because both devices respond to similar APIs
@@ -106,6 +122,12 @@ class SiteScanner:
             self.username = self.site_config.get("username", self.username)
             self.password = self.site_config.get("password", self.password)
             self.timeout = self.site_config.get("timeout", self.timeout)
+            
+            # Size the shared HTTP connection pool used by the device handlers
+            configure_session_pool(
+                self.site_config.get("pooled_hosts", DEFAULT_POOL_CONNECTIONS),
+                self.site_config.get("pooled_connections_per_host", DEFAULT_POOL_MAXSIZE)
+            )
         
         # Raw scan data storage - will hold complete device data
         self.raw_scan_data = {}
@@ -183,7 +205,7 @@ class SiteScanner:
         if "/" in ip_range:
             try:
                 network = ipaddress.ip_network(ip_range)
-                return [str(ip) for ip in network.hosts()]
+                return network_hosts(network)
             except ValueError as e:
                 print(f"❌ Error parsing CIDR range '{ip_range}': {e}")
                 return []
@@ -257,6 +279,10 @@ class SiteScanner:
         responsive_ips = []
         max_workers = 50  # Number of threads
         
+        # Found-IP and error lines are buffered and written in batches so that
+        # neither the workers nor the result loop contend for stdout per host
+        output_buffer = []
+        
         with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
             future_to_ip = {
                 executor.submit(self.check_ip_responsive, ip): ip 
@@ -269,8 +295,18 @@ class SiteScanner:
                     is_responsive = future.result()
                     if is_responsive:
                         responsive_ips.append(ip)
+                        output_buffer.append(f"Found active IP: {ip}\n")
                 except Exception as exc:
-                    print(f"IP {ip} generated an exception: {exc}")
+                    output_buffer.append(f"IP {ip} generated an exception: {exc}\n")
+                
+                if len(output_buffer) >= 64:
+                    sys.stdout.write("".join(output_buffer))
+                    sys.stdout.flush()
+                    output_buffer.clear()
+        
+        if output_buffer:
+            sys.stdout.write("".join(output_buffer))
+            sys.stdout.flush()
         
         return responsive_ips
         
@@ -729,10 +765,8 @@ class SiteScanner:
             sock.close()
             
             # Якщо результат 0, підключення успішне
-            is_responsive = result == 0
-            if is_responsive:
-                print(f"Found active IP: {ip}")
-            return is_responsive
+            # (found IPs are reported by the calling scan loop in batches)
+            return result == 0
         except socket.error as e:
             print(f"Socket error for {ip}: {str(e)}")
             return False
@@ -763,18 +797,24 @@ class SiteScanner:
             "summary": {}
         }
         
+        # Scan settings are the same for every IP range of the subsection
+        use_async_tcp = getattr(self, "use_async_tcp", False)
+        tcp_ports = getattr(self, "tcp_ports", [80, 443])
+        tcp_concurrency = getattr(self, "tcp_concurrency", 1000)
+        tcp_timeout = getattr(self, "tcp_timeout", 0.5)
+        
         # Scan each IP range in this subsection
         all_active_ips = []
         for ip_range in ip_ranges:
             # Use fast async TCP scanner by default (configurable)
-            if getattr(self, "use_async_tcp", False):
+            if use_async_tcp:
                 if verbose:
-                    print(f"Using async TCP scan for {ip_range} (ports={self.tcp_ports}, conc={self.tcp_concurrency}, timeout={self.tcp_timeout})")
+                    print(f"Using async TCP scan for {ip_range} (ports={tcp_ports}, conc={tcp_concurrency}, timeout={tcp_timeout})")
                 active_ips = self.scan_ip_range_async_tcp(
                     ip_range,
-                    ports=getattr(self, "tcp_ports", [80, 443]),
-                    concurrency=getattr(self, "tcp_concurrency", 1000),
-                    per_host_timeout=getattr(self, "tcp_timeout", 0.5),
+                    ports=tcp_ports,
+                    concurrency=tcp_concurrency,
+                    per_host_timeout=tcp_timeout,
                     verbose=verbose,
                 )
             else:
@@ -801,8 +841,14 @@ class SiteScanner:
                 # Add device type information to the result
                 result["device_type"] = device_type
                 result["device_type_source"] = device_info.get("source")
+                result["main_type"] = DeviceRegistry.normalize_device_type(device_type)
                 result["ip"] = ip
                 
+                # Intern the message, which repeats across many devices
+                message = result.get("message")
+                if isinstance(message, str):
+                    result["message"] = sys.intern(message)
+                
                 # Store in subsection results
                 subsection_results["devices"][ip] = result
                 
@@ -874,7 +920,10 @@ class SiteScanner:
         # Check hashboards
         if "hashboards" in device_data:
             expected_hashboards = model_config.get("HB", 3)
-            active_hashboards = sum(1 for hb in device_data.get("hashboards", []) if hb.get("status") == "active")
+            active_hashboards = 0
+            for hb in device_data.get("hashboards", []):
+                if hb.get("status") == "active":
+                    active_hashboards += 1
             
             if active_hashboards < expected_hashboards:
                 issues["hashboards"] = f"Missing {expected_hashboards - active_hashboards} Hashboard(s)"
@@ -882,7 +931,10 @@ class SiteScanner:
         # Check fans
         if "fans" in device_data:
             expected_fans = model_config.get("fans", 2)
-            active_fans = sum(1 for fan in device_data.get("fans", []) if fan.get("speed", 0) > 0)
+            active_fans = 0
+            for fan in device_data.get("fans", []):
+                if fan.get("speed", 0) > 0:
+                    active_fans += 1
             
             if active_fans < expected_fans:
                 issues["fans"] = f"No fans" if active_fans == 0 else f"Missing {expected_fans - active_fans} Fan(s)"
@@ -919,26 +971,20 @@ class SiteScanner:
         devices = subsection_results.get("devices", {})
         
         # Group devices by type
-        devices_by_type = {}
-        devices_with_issues = {}
+        devices_by_type = defaultdict(list)
+        devices_with_issues = defaultdict(list)
         
         for ip, device_data in devices.items():
-            device_type = device_data.get("device_type", "unknown")
-            
-            # Normalize device type
-            device_type = DeviceRegistry.normalize_device_type(device_type)
+            # Normalized at scan time; results from elsewhere are normalized here
+            device_type = device_data.get("main_type") or DeviceRegistry.normalize_device_type(
+                device_data.get("device_type", "unknown"))
             
             # Add to device type group
-            if device_type not in devices_by_type:
-                devices_by_type[device_type] = []
             devices_by_type[device_type].append(ip)
             
             # Check for issues
             issues = self.analyze_device_issues(device_data)
             if issues:
-                if device_type not in devices_with_issues:
-                    devices_with_issues[device_type] = []
-                
                 devices_with_issues[device_type].append({
                     "ip": ip,
                     "issues": issues
@@ -947,14 +993,14 @@ class SiteScanner:
         # Generate summary
         summary = {
             "working": {},
-            "issues": devices_with_issues,
+            "issues": dict(devices_with_issues),
             "comparison": {}
         }
         
         # Summarize working devices by type
         for device_type, ips in devices_by_type.items():
             # Count devices with issues
-            issues_count = sum(1 for issues in devices_with_issues.get(device_type, []))
+            issues_count = len(devices_with_issues.get(device_type, ()))
             working_count = len(ips) - issues_count
             
             summary["working"][device_type] = working_count
@@ -1000,39 +1046,48 @@ class SiteScanner:
             filename = f"{output_dir}/site_scan_{site_id}_{timestamp}.json"
         
         # Save JSON results
-        with open(filename, 'w') as f:
-            json.dump(results, f, indent=2)
+        if ORJSON_AVAILABLE:
+            # orjson encodes straight to UTF-8 bytes
+            with open(filename, 'wb') as f:
+                f.write(orjson.dumps(results, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        else:
+            with open(filename, 'w') as f:
+                json.dump(results, f, indent=2)
         
         print(f"✅ Results saved to {filename}")
         return filename
     
-    def print_subsection_report(self, subsection_result: Dict[str, Any]) -> None:
+    def format_subsection_report(self, subsection_result: Dict[str, Any]) -> List[str]:
         """
-        Print a human-readable report for a subsection
+        Build the lines of a human-readable report for a subsection
         
         Args:
             subsection_result: Scan results for a subsection
+            
+        Returns:
+            List of report lines
         """
         subsection_name = subsection_result.get("name", "Unnamed Subsection")
         ip_ranges = subsection_result.get("ip_ranges", [])
         summary = subsection_result.get("summary", {})
+        lines = []
         
-        # Print header
-        print(f"\n{'—'*40}")
-        print(f"{subsection_name} = {', '.join(ip_ranges)}")
+        # Header
+        lines.append(f"\n{'—'*40}")
+        lines.append(f"{subsection_name} = {', '.join(ip_ranges)}")
         
-        # Print working devices
-        print("\nWorking:")
+        # Working devices
+        lines.append("\nWorking:")
         working = summary.get("working", {})
         if working:
             for device_type, count in working.items():
                 if count > 0:
-                    print(f"{count}x {device_type}")
+                    lines.append(f"{count}x {device_type}")
         else:
-            print("None")
+            lines.append("None")
         
-        # Print issues
-        print("\nIssues:")
+        # Issues
+        lines.append("\nIssues:")
         issues = summary.get("issues", {})
         if issues:
             for device_type, devices_with_issues in issues.items():
@@ -1043,12 +1098,12 @@ class SiteScanner:
                             issue_texts.append(issue_desc)
                     
                     if issue_texts:
-                        print(f"1x {device_type} -> {' & '.join(issue_texts)}")
+                        lines.append(f"1x {device_type} -> {' & '.join(issue_texts)}")
         else:
-            print("None")
+            lines.append("None")
         
-        # Print theoretical vs real comparison
-        print("\nTheoretical Online vs Real")
+        # Theoretical vs real comparison
+        lines.append("\nTheoretical Online vs Real")
         comparison = summary.get("comparison", {})
         for device_type, stats in comparison.items():
             expected = stats.get("expected", 0)
@@ -1059,12 +1114,26 @@ class SiteScanner:
             # Format offline warning if needed
             offline_warning = f"  {offline} Miners are offline !!!" if offline > 0 else ""
             
-            print(f"{actual} out of {expected} {device_type} online with {issues_count} issues.{offline_warning}")
+            lines.append(f"{actual} out of {expected} {device_type} online with {issues_count} issues.{offline_warning}")
+        
+        return lines
+    
+    def print_subsection_report(self, subsection_result: Dict[str, Any]) -> None:
+        """
+        Print a human-readable report for a subsection
+        
+        Args:
+            subsection_result: Scan results for a subsection
+        """
+        lines = self.format_subsection_report(subsection_result)
+        sys.stdout.write("\n".join(lines) + "\n")
     
     def print_site_report(self, site_results: Dict[str, Any]) -> None:
         """
         Print a complete site report
         
+        The report is assembled as a list of lines and written in one call.
+        
         Args:
             site_results: Complete scan results for a site
         """
@@ -1083,16 +1152,18 @@ class SiteScanner:
             time_display = f"{minutes} min {remaining_seconds} sec ({duration} seconds)"
         else:
             time_display = f"{duration} seconds"
-            
-        print(f"\nScan completed for {site_id} (Time taken: {time_display})")
         
-        print(f"Timestamp: {timestamp}")
+        lines = [
+            f"\nScan completed for {site_id} (Time taken: {time_display})",
+            f"Timestamp: {timestamp}",
+        ]
         
-        # Print each subsection
+        # Add each subsection
         for subsection in subsections:
-            self.print_subsection_report(subsection)
+            lines.extend(self.format_subsection_report(subsection))
         
-        print(f"\n{'—'*40}")
+        lines.append(f"\n{'—'*40}")
+        sys.stdout.write("\n".join(lines) + "\n")
 
 
 def compare_ip_libraries(ip_range="192.168.1.0/24"):
@@ -4,21 +4,24 @@ Subnet Scanner Tool
 For scanning IP subnets, detecting device types, and fetching logs
 """
 
+import asyncio
 import ipaddress
-import concurrent.futures
-import requests
-from requests.auth import HTTPDigestAuth
+import urllib3
 import json
 import re
 import os
+import sys
 import argparse
 import datetime
-from typing import List, Dict, Any, Optional, Union
+import logging
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import List, Dict, Any, Optional, Union, Tuple, Callable, Awaitable
 
 # Try importing websocket packages
 # First, try the asyncio-based websockets package (preferred)
 try:
-    import asyncio
     import websockets
     WEBSOCKETS_ASYNCIO_AVAILABLE = True
 except ImportError:
@@ -36,6 +39,17 @@ except ImportError:
 # Define if any websocket capability is available
 WEBSOCKET_AVAILABLE = WEBSOCKETS_ASYNCIO_AVAILABLE or WEBSOCKET_CLIENT_AVAILABLE
 
+# Try importing orjson for faster JSON parsing and report writing
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    print("⚠️ Orjson package not available. Install with 'pip install orjson' to enable faster JSON report writing.")
+
+# Device endpoints are plain HTTP; silence certificate warnings once instead of per request
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
 # Import device components
 from device_manager import DeviceManager
 from handlers import t21_handler
@@ -46,11 +60,16 @@ from handlers import s21_pro_handler
 from handlers import s19j_pro_handler
 from handlers import dg1_handler
 from device_registry import DeviceRegistry
+from ip_utils import iter_network_hosts, network_size
+from http_client import (DEFAULT_POOL_CONNECTIONS, DEFAULT_POOL_MAXSIZE,
+                         configure_session_pool)
 
 # Ensure Z15j is checked before Z15 in device detection
 # This is critical because both devices respond to similar APIs
 DeviceRegistry.reorder_detectors(preferred_order=["Z15j", "Z15", "T21", "S21", "S21Pro", "S19jPro", "DG1"])
 
+logger = logging.getLogger(__name__)
+
 class SubnetScanner:
     """
     Subnet Scanner tool for scanning IP ranges, detecting device types, 
@@ -64,6 +83,13 @@ class SubnetScanner:
         self.username = "root"
         self.password = "root"
         self.timeout = 5
+        self.scan_concurrency = 256
+        self.fetch_concurrency = 32
+        self.device_timeout = 120
+        self.scan_warmup_size = 64
+        self.scan_chunk_size = 1024
+        self.tcp_probe_timeout = 0.5
+        self.probe_port = 80
         self.results = {}
         self.active_ips = []
         
@@ -78,6 +104,16 @@ class SubnetScanner:
             self.username = self.config.get("username", self.username)
             self.password = self.config.get("password", self.password)
             self.timeout = self.config.get("timeout", self.timeout)
+            self.scan_concurrency = self.config.get("scan_concurrency", self.scan_concurrency)
+            self.fetch_concurrency = self.config.get("fetch_concurrency", self.fetch_concurrency)
+            self.device_timeout = self.config.get("device_timeout", self.device_timeout)
+            self.tcp_probe_timeout = self.config.get("tcp_probe_timeout", self.tcp_probe_timeout)
+            
+            # Size the shared HTTP connection pool used by the device handlers
+            configure_session_pool(
+                self.config.get("pooled_hosts", DEFAULT_POOL_CONNECTIONS),
+                self.config.get("pooled_connections_per_host", DEFAULT_POOL_MAXSIZE)
+            )
     
     # ==========================================
     # Configuration and Setup Methods
@@ -106,9 +142,10 @@ class SubnetScanner:
             return default_config
             
         try:
-            with open(config_file, 'r') as f:
-                config = json.load(f)
-                return config
+            with open(config_file, 'rb') as f:
+                data = f.read()
+            config = orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+            return config
         except Exception as e:
             print(f"❌ Error loading config file: {e}")
             return default_config
@@ -121,6 +158,8 @@ class SubnetScanner:
         """
         Scan a subnet and return a list of responsive IP addresses
         
+        Does not modify active_ips; scan_subnets sets it once for all subnets.
+        
         Args:
             subnet: Subnet in CIDR notation (e.g., '192.168.1.0/24')
             verbose: Whether to print detailed output for each found host
@@ -133,96 +172,341 @@ class SubnetScanner:
             # Always display this information, regardless of verbose setting
             print(f"Starting scan of subnet {subnet} ({network.num_addresses} addresses)")
             
-            responsive_ips = []
-            
-            # Use thread pool for faster scanning
-            with concurrent.futures.ThreadPoolExecutor(max_workers=50) as executor:
-                future_to_ip = {
-                    executor.submit(self.check_ip_responsive, str(ip)): str(ip) 
-                    for ip in network.hosts()
-                }
-                
-                for future in concurrent.futures.as_completed(future_to_ip):
-                    ip = future_to_ip[future]
-                    try:
-                        is_responsive = future.result()
-                        if is_responsive:
-                            responsive_ips.append(ip)
-                            # Disable output about found hosts
-                            # if verbose:
-                            #    print(f"✅ Found responsive host: {ip}")
-                    except Exception as e:
-                        if verbose:
-                            print(f"❌ Error checking {ip}: {e}")
-            
-            self.active_ips = responsive_ips
-            return responsive_ips
+            # Probe all hosts concurrently from a single event loop
+            return asyncio.run(self._scan_async(network, verbose=verbose))
             
         except ValueError as e:
             print(f"❌ Error: {e}")
             return []
 
-    def check_ip_responsive(self, ip: str) -> bool:
-        """Check if an IP responds to HTTP requests"""
-        try:
-            response = requests.get(f"http://{ip}/", 
-                                   auth=HTTPDigestAuth(self.username, self.password),
-                                   timeout=self.timeout)
-            return True
-        except requests.RequestException:
-            return False
+    async def _scan_async(self, network: Union[ipaddress.IPv4Network, ipaddress.IPv6Network],
+                          verbose: bool = True,
+                          on_found: Optional[Callable[[str], Awaitable[None]]] = None) -> List[str]:
+        """
+        Probe every host of a network with a TCP connect to probe_port (80)
+        
+        A warm-up batch is probed first; the 90th percentile of its connect
+        round-trip times decides how many probes run concurrently afterwards.
+        Hosts are probed in chunks so only a bounded number of probe tasks
+        exist at any time, even on very large networks. Warm-up connects are
+        bounded by the HTTP timeout so that slow round trips can be measured;
+        after that they are bounded by tcp_probe_timeout, so the many dead
+        hosts of a sparse network are dropped after about one round trip.
+        
+        Args:
+            network: Network to scan
+            verbose: Whether to print errors for individual hosts
+            on_found: Optional coroutine function awaited with each responsive
+                      IP as soon as its connect succeeds
+            
+        Returns:
+            List of responsive IP addresses
+        """
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(self.scan_concurrency)
+        # Long enough for the warm-up to measure round trips in every latency tier
+        probe_timeout = self.timeout
+        port = self.probe_port
+        rtts = []
+        
+        async def _probe(ip: str) -> bool:
+            async with semaphore:
+                started = loop.time()
+                try:
+                    reader, writer = await asyncio.wait_for(asyncio.open_connection(ip, port),
+                                                            timeout=probe_timeout)
+                except ConnectionRefusedError:
+                    # A refused connection still measures one round trip
+                    rtts.append(loop.time() - started)
+                    return False
+                except (asyncio.TimeoutError, OSError):
+                    return False
+                
+                # Connected successfully, close immediately
+                rtts.append(loop.time() - started)
+                writer.close()
+                try:
+                    await writer.wait_closed()
+                except Exception:
+                    pass
+                return True
+        
+        async def _probe_and_report(ip: str) -> bool:
+            # Hand the IP on right away, outside the semaphore, instead of after the chunk
+            alive = await _probe(ip)
+            if alive and on_found:
+                await on_found(ip)
+            return alive
+        
+        responsive_ips = []
+        
+        async def _probe_chunk(chunk: List[str]) -> None:
+            results = await asyncio.gather(*[_probe_and_report(ip) for ip in chunk], return_exceptions=True)
+            for ip, result in zip(chunk, results):
+                if isinstance(result, Exception):
+                    if verbose:
+                        print(f"❌ Error checking {ip}: {result}")
+                elif result:
+                    responsive_ips.append(ip)
+        
+        # Hosts are generated lazily and taken a chunk at a time
+        hosts = iter_network_hosts(network)
+        
+        # Warm-up batch at full concurrency to sample the network latency
+        warmup_size = self.scan_warmup_size
+        await _probe_chunk(list(islice(hosts, warmup_size)))
+        probe_timeout = self.tcp_probe_timeout
+        
+        if network.num_addresses > warmup_size:
+            # Probes that timed out hit dead hosts and say nothing about latency, so
+            # only measured round trips count; without any, keep full concurrency
+            if rtts:
+                rtt_p90 = sorted(rtts)[int(len(rtts) * 0.9)]
+                semaphore = asyncio.Semaphore(self._concurrency_for_rtt(rtt_p90, network.num_addresses - warmup_size))
+            
+            chunk = list(islice(hosts, self.scan_chunk_size))
+            while chunk:
+                await _probe_chunk(chunk)
+                chunk = list(islice(hosts, self.scan_chunk_size))
+        
+        return responsive_ips
+
+    def _concurrency_for_rtt(self, rtt: float, host_count: int) -> int:
+        """
+        Pick the number of concurrent probes for an observed round-trip time
+        
+        Args:
+            rtt: 90th percentile connect round-trip time in seconds
+            host_count: Number of hosts left to probe
+            
+        Returns:
+            Number of probes to run concurrently, capped by scan_concurrency
+        """
+        if rtt < 0.2:
+            concurrency = min(self.scan_concurrency, host_count)
+        elif rtt < 0.3:
+            concurrency = 128
+        elif rtt < 0.4:
+            concurrency = 64
+        elif rtt < 0.7:
+            concurrency = 32
+        else:
+            concurrency = 16
+        return max(1, min(concurrency, self.scan_concurrency))
     
     def scan_subnets(self) -> List[str]:
         """
         Scan all configured subnets and return active IPs
         
+        Device detection and log fetching start as soon as the first
+        responsive IPs are found, while the remaining hosts are still being
+        swept, instead of waiting for every subnet to finish.
+        
         Returns:
             List of all responsive IP addresses across all configured subnets
         """
-        all_active_ips = []
-        all_results = {}
+        all_active_ips, results = asyncio.run(self._scan_and_collect_async(self.config.get("subnets")))
         
-        # Scan each subnet without printing details for each IP
-        for subnet in self.config.get("subnets"):
-            # Scan the subnet
-            print(f"🔍 Scanning subnet: {subnet}")
-            subnet_ips = self.scan_subnet(subnet, verbose=False)
+        self.active_ips = all_active_ips
+        self.results = results
+        
+        return all_active_ips
+    
+    async def _scan_and_collect_async(self, subnets: List[str]) -> Tuple[List[str], Dict[str, Dict[str, Any]]]:
+        """
+        Sweep subnets and collect devices as a producer/consumer pipeline
+        
+        The sweep puts each responsive IP on a bounded queue; fetch workers
+        take IPs off the queue and detect and fetch logs for them meanwhile.
+        
+        Args:
+            subnets: Subnets in CIDR notation
             
-            # If active IPs found in this subnet
-            if subnet_ips:
-                # First detect device types
-                for ip in subnet_ips:
-                    # Detect device type using the device_manager (quietly)
-                    device_info = self.device_manager.detect_device_type(ip, verbose=False)
-                    
-                    # Get logs for each IP
-                    self.active_ips = [ip]  # Temporarily set one IP for getting logs
+        Returns:
+            Tuple of the responsive IP addresses and the dictionary mapping
+            each IP address to its log result
+        """
+        # Subnets with a fixed device type skip the detection phase entirely
+        known_device_types = self.config.get("device_types", {})
+        
+        queue = asyncio.Queue(maxsize=1024)
+        outcomes = {}
+        all_active_ips = []
+        # Repeated or overlapping subnets find the same IP more than once
+        queued_ips = set()
+        worker_count = self.fetch_concurrency
+        
+        async def _produce() -> None:
+            try:
+                # Scan each subnet without printing details for each IP
+                for subnet in subnets:
+                    print(f"🔍 Scanning subnet: {subnet}")
+                    try:
+                        network = ipaddress.ip_network(subnet)
+                    except ValueError as e:
+                        print(f"❌ Error: {e}")
+                        continue
+                    print(f"Starting scan of subnet {subnet} ({network.num_addresses} addresses)")
                     
-                    # Get the device type
-                    device_type = device_info.get("device_type", "unknown")
+                    known_type = known_device_types.get(subnet)
+                    if known_type and not DeviceRegistry.get_handler(known_type):
+                        print(f"⚠️ No handler registered for device type {known_type} of subnet {subnet}, detecting instead")
+                        known_type = None
                     
-                    # Fetch logs using device_manager (which will use the appropriate handler)
-                    result = self.device_manager.fetch_logs_from_device(ip, device_type, verbose=False)
+                    async def _enqueue(ip: str, known_type: Optional[str] = known_type) -> None:
+                        if ip in queued_ips:
+                            return
+                        queued_ips.add(ip)
+                        await queue.put((ip, known_type))
                     
-                    if result:
-                        # Add device type information to the result
-                        result["device_type"] = device_type
-                        result["device_type_source"] = device_info.get("source")
-                        all_results[ip] = result
+                    all_active_ips.extend(await self._scan_async(network, verbose=False, on_found=_enqueue))
+            finally:
+                # One end marker per worker
+                for _ in range(worker_count):
+                    await queue.put(None)
+        
+        executor = ThreadPoolExecutor(max_workers=worker_count)
+        try:
+            await asyncio.gather(_produce(), *[self._fetch_worker(queue, executor, outcomes)
+                                               for _ in range(worker_count)])
+        finally:
+            # Don't wait for handlers that are still stuck on a timed-out device
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        # Keep the first occurrence of IPs found by more than one subnet
+        all_active_ips = list(dict.fromkeys(all_active_ips))
+        return all_active_ips, self._results_from_outcomes(all_active_ips, outcomes)
+    
+    async def _fetch_worker(self, queue: asyncio.Queue, executor: ThreadPoolExecutor,
+                            outcomes: Dict[str, Any]) -> None:
+        """
+        Collect devices taken off a queue until an end marker (None) arrives
+        
+        A device that takes longer than device_timeout is recorded as an error
+        instead of holding up the worker. The timeout only starts once the
+        handler is running on a pool thread, so a device that is queued behind
+        threads still stuck on timed-out devices is not blamed for their delay.
+        A device that gets no free thread within device_timeout is recorded as
+        an error as well. The handler of a timed-out device is not interrupted:
+        its thread keeps running until its own request timeouts fire, and the
+        interpreter still waits for it before exiting.
+        
+        Args:
+            queue: Queue of (ip, known device type or None) items
+            executor: Worker pool that runs the blocking handlers
+            outcomes: Dictionary that receives each IP's result or exception
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
             
-            # Add to overall list
-            all_active_ips.extend(subnet_ips)
-                
-        # Store all results
-        self.results = all_results
-        self.active_ips = all_active_ips
+            ip, known_type = item
+            started = asyncio.Event()
+            
+            def _run(ip: str = ip, known_type: Optional[str] = known_type,
+                     started: asyncio.Event = started) -> Optional[Dict[str, Any]]:
+                loop.call_soon_threadsafe(started.set)
+                return self._collect_device(ip, known_type)
+            
+            future = loop.run_in_executor(executor, _run)
+            try:
+                # Wait for a free pool thread first, then time the handler itself
+                await asyncio.wait_for(started.wait(), timeout=self.device_timeout)
+            except asyncio.TimeoutError:
+                future.cancel()
+                outcomes[ip] = RuntimeError(f"No free worker thread within {self.device_timeout} seconds")
+                continue
+            
+            try:
+                outcomes[ip] = await asyncio.wait_for(future, timeout=self.device_timeout)
+            except Exception as e:
+                outcomes[ip] = e
+    
+    def _results_from_outcomes(self, ips: List[str], outcomes: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """
+        Turn collected outcomes into log results, in the order of the given IPs
         
-        return all_active_ips
+        Args:
+            ips: Responsive IP addresses
+            outcomes: Dictionary mapping IP address to its result or exception
+            
+        Returns:
+            Dictionary mapping IP address to its log result
+        """
+        # Pre-size the result dict with every IP, then fill it in place
+        collected = dict.fromkeys(ips)
+        for ip in ips:
+            result = outcomes.get(ip)
+            if isinstance(result, asyncio.TimeoutError):
+                collected[ip] = {"ip": ip, "status": "error",
+                                 "message": f"Timed out after {self.device_timeout} seconds"}
+            elif isinstance(result, Exception):
+                collected[ip] = {"ip": ip, "status": "error", "message": f"Error: {str(result)}"}
+            elif result:
+                collected[ip] = result
+            else:
+                collected.pop(ip, None)
+        
+        return collected
+    
+    def _collect_device(self, ip: str, known_type: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Detect the device type of a single IP and fetch its logs
         
+        Args:
+            ip: IP address of the device
+            known_type: Device type to use instead of running detection
+            
+        Returns:
+            Log result with device type information, or None if nothing was returned
+        """
+        if known_type:
+            device_info = {"device_type": known_type, "device_type_source": "config"}
+        else:
+            # Detect device type using the device_manager (quietly)
+            device_info = self.device_manager.detect_device_type(ip, verbose=False)
+        
+        # Get the device type
+        device_type = device_info.get("device_type", "unknown")
+        
+        # Fetch logs using device_manager (which will use the appropriate handler)
+        result = self.device_manager.fetch_logs_from_device(ip, device_type, verbose=False)
+        
+        if result:
+            # Add device type information to the result
+            result["device_type"] = device_type
+            result["device_type_source"] = device_info.get("device_type_source")
+            
+            # Classify once here so the reports don't normalize the type again
+            result["main_type"] = DeviceRegistry.normalize_device_type(device_type)
+            
+            # The same message is reported by many devices; intern it so that
+            # grouping in the reports compares and stores a single string
+            message = result.get("message")
+            if isinstance(message, str):
+                result["message"] = sys.intern(message)
+        return result
+    
     # ==========================================
     # Report Generation Methods
     # ==========================================
     
+    @staticmethod
+    def _result_main_type(result: Dict[str, Any]) -> str:
+        """
+        Get the normalized device type of a result
+        
+        Args:
+            result: Log result of a single device
+            
+        Returns:
+            Type stored at collection time, or the normalized device_type for
+            results that were not collected by this scanner
+        """
+        return result.get("main_type") or DeviceRegistry.normalize_device_type(result.get("device_type", "unknown"))
+    
     def save_results_to_file(self, filename: str = "scan_results.json") -> None:
         """
         Save scan results to a JSON file with improved formatting
@@ -244,28 +528,26 @@ class SubnetScanner:
         }
         
         # Process and group devices by type
+        devices_by_type = structured_results["devices_by_type"] = defaultdict(dict)
         for ip, result in self.results.items():
-            device_type = result.get("device_type", "unknown")
-            
-            # Normalize device type (handle common variations)
-            main_type = DeviceRegistry.normalize_device_type(device_type)
-            
-            # Initialize device type group if not exists
-            if main_type not in structured_results["devices_by_type"]:
-                structured_results["devices_by_type"][main_type] = {}
-            
             # Add device to its type group
-            structured_results["devices_by_type"][main_type][ip] = result
+            devices_by_type[self._result_main_type(result)][ip] = result
         
         # Add device type counts to summary
         device_counts = {}
-        for device_type, devices in structured_results["devices_by_type"].items():
+        for device_type, devices in devices_by_type.items():
             device_counts[device_type] = len(devices)
         structured_results["scan_summary"]["device_counts"] = device_counts
         
         # Save structured JSON results
-        with open(filename, 'w') as f:
-            json.dump(structured_results, f, indent=2)
+        if ORJSON_AVAILABLE:
+            # orjson encodes straight to UTF-8 bytes; non-string keys (e.g. error
+            # codes in handler results) are stringified as json.dump would
+            with open(filename, 'wb') as f:
+                f.write(orjson.dumps(structured_results, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        else:
+            with open(filename, 'w') as f:
+                json.dump(structured_results, f, indent=2)
         
         # print(f"✅ Results saved to {filename}")
     
@@ -291,119 +573,99 @@ class SubnetScanner:
             "json_report": output_file,
         }
         
-    def print_device_types_report(self):
+    def print_device_types_report(self, device_types: Optional[Dict[str, int]] = None):
         """
         Print only the device types summary section of the report
+        
+        Args:
+            device_types: Device counts by normalized type, if already computed
+                          by the caller; counted from the results otherwise
         """
+        subnets = self.config.get('subnets')
+        
         # Get total IPs scanned across all subnets
-        total_ips_scanned = sum(ipaddress.ip_network(subnet).num_addresses 
-                                for subnet in self.config.get('subnets'))
+        total_ips_scanned = sum(network_size(subnet) for subnet in subnets)
         
         responsive_ips = len(self.active_ips)
         unresponsive_ips = total_ips_scanned - responsive_ips
         
-        # Group devices by detected type
-        device_types = {}
-        
-        for ip, result in self.results.items():
-            # Process all devices regardless of log fetch status
-            device_type = result.get("device_type", "unknown")
-            
-            # Use the device registry to normalize device type
-            main_type = DeviceRegistry.normalize_device_type(device_type)
-            
-            if main_type not in device_types:
-                device_types[main_type] = []
-            device_types[main_type].append(ip)
-        
-        # Print summary report header
-        print(f"\n{'='*40}")
-        print(f"============ Scanner Report ============")
-        print(f"{'='*40}")
-        
-        # Print subnet information
-        print(f"Subnets scanned: {', '.join(self.config.get('subnets'))}")
-        print(f"IPs scanned: {total_ips_scanned}")
-        print(f"Responsive IPs: {responsive_ips}")
-        
-        # Print device type counts
-        print(f"\nDevice Types Found:")
-        for device_type, ips in device_types.items():
-            print(f"• {device_type}: {len(ips)} devices")
-        
-        print(f"IPs unresponsive: {unresponsive_ips}")
+        # Count devices by detected type in a single pass
+        # (all devices regardless of log fetch status, normalized by the device registry)
+        if device_types is None:
+            device_types = Counter(self._result_main_type(result) for result in self.results.values())
+        
+        # Summary report header and subnet information, assembled and written in one call
+        lines = [
+            f"\n{'='*40}",
+            "============ Scanner Report ============",
+            f"{'='*40}",
+            f"Subnets scanned: {', '.join(subnets)}",
+            f"IPs scanned: {total_ips_scanned}",
+            f"Responsive IPs: {responsive_ips}",
+            "\nDevice Types Found:",
+        ]
+        
+        # Device type counts
+        lines.extend(f"• {device_type}: {count} devices" for device_type, count in device_types.items())
+        
+        lines.append(f"IPs unresponsive: {unresponsive_ips}")
+        sys.stdout.write("\n".join(lines) + "\n")
 
     def print_aggregate_report(self):
         """
         Print an aggregate report of scan results, grouping devices by type
         and normalizing error messages for better readability
         """
-        # Print the device types report first
-        self.print_device_types_report()
-        
-        # Aggregate errors by device type and message
-        device_error_groups = {}
-        
-        # Aggregate errors by device type and message
-        device_error_groups = {}
+        # Count device types and aggregate errors by device type and message in one pass
+        device_types = Counter()
+        device_error_groups = defaultdict(lambda: defaultdict(list))
         
         for ip, result in self.results.items():
             # Get device type with normalized format using the registry
-            device_type = result.get("device_type", "unknown")
-            main_type = DeviceRegistry.normalize_device_type(device_type)
+            main_type = self._result_main_type(result)
+            device_types[main_type] += 1
             
-            # Skip this result if it's flagged to be ignored (successful checks)
-            if result.get('ignore_success', False):
+            # Get message, all devices may have messages (error or success); devices
+            # without one, or flagged to be ignored (successful checks), are only counted
+            message = result.get('message')
+            if not message or result.get('ignore_success', False):
                 continue
-                
-            # Get message, all devices may have messages (error or success)
-            message = result.get('message', '')
             
-            if message:
-                # Use device type from the result to ensure proper classification
-                
-                if main_type not in device_error_groups:
-                    device_error_groups[main_type] = {}
-                
-                # Normalize the message to group similar errors using device handlers
-                normalized_message = message
-                
-                # Use device handlers to normalize messages
-                handler_class = DeviceRegistry.get_handler(main_type)
-                if handler_class:
-                    try:
-                        handler = handler_class(self)
-                        normalized_message = handler.normalize_message(message)
-                    except Exception as e:
-                        # If normalization fails, fall back to the original message
-                        print(f"Error during message normalization for {main_type}: {str(e)}")
-                
-                # Store the normalized message in the error groups
-                if normalized_message not in device_error_groups[main_type]:
-                    device_error_groups[main_type][normalized_message] = []
-                
-                # Add this IP to the list for this message group
-                device_error_groups[main_type][normalized_message].append(ip)
+            # Normalize the message to group similar errors using device handlers
+            normalized_message = message
+            
+            # Use device handlers to normalize messages
+            handler_class = DeviceRegistry.get_handler(main_type)
+            if handler_class:
+                try:
+                    handler = handler_class(self)
+                    normalized_message = handler.normalize_message(message)
+                except Exception as e:
+                    # If normalization fails, fall back to the original message
+                    logger.warning("Error during message normalization for %s: %s", main_type, e)
+            
+            # Add this IP to the list for this message group of its device type
+            device_error_groups[main_type][normalized_message].append(ip)
         
-        # Print error groups by device type if any exist
+        # Print the device types report first
+        self.print_device_types_report(device_types)
+        
+        # Print error groups by device type if any exist, assembled and written in one call
         if device_error_groups:
-            print(f"\n{'='*40}")
-            print(f"Grouped Messages by Device Type:")
-            print(f"{'='*40}")
+            lines = [f"\n{'='*40}", "Grouped Messages by Device Type:", f"{'='*40}"]
             
             # Sort device types to put 'unknown' at the end
-            sorted_device_types = sorted(device_error_groups.keys(), key=lambda x: (x == "unknown", x))
+            sorted_device_types = sorted(device_error_groups, key=lambda x: (x == "unknown", x))
             
             for device_type in sorted_device_types:
                 message_groups = device_error_groups[device_type]
-                print(f"\nErrors found on {device_type} devices:")
+                lines.append(f"\nErrors found on {device_type} devices:")
                 
                 for message, ips in message_groups.items():
-                    # Display all IPs in the list
-                    ip_display = ", ".join(ips)
-                    
-                    # Display the normalized message (without timestamps)
-                    print(f"• 📝 Message  : {message} | {len(ips)} devices | {ip_display}")
+                    # Display the normalized message (without timestamps) and all IPs in the list
+                    lines.append(f"• 📝 Message  : {message} | {len(ips)} devices | {', '.join(ips)}")
+            
+            sys.stdout.write("\n".join(lines) + "\n")
 
 # Main function for command-line usage
 def main():
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+import os
+import sys
+import unittest
+
+# Add the parent directory to the path so we can import the modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from device_handler import DeviceHandler
+
+
+class TestSplitTimestamp(unittest.TestCase):
+    """Test case for splitting timestamped log lines"""
+    
+    def test_well_formed_line(self):
+        """A line starting with a timestamp is split into date, time and message"""
+        self.assertEqual(
+            DeviceHandler.split_timestamp("2025-06-28 09:23:01 Fan speed low"),
+            ("2025-06-28", "09:23:01", "Fan speed low")
+        )
+    
+    def test_extra_spaces_before_message(self):
+        """Spaces between the time and the message are not part of the message"""
+        self.assertEqual(
+            DeviceHandler.split_timestamp("2025-06-28 09:23:01   Fan speed low"),
+            ("2025-06-28", "09:23:01", "Fan speed low")
+        )
+    
+    def test_timestamp_not_at_start(self):
+        """Timestamps after a prefix are found by the regex fallback"""
+        self.assertEqual(
+            DeviceHandler.split_timestamp("[kernel] 2025-06-28 09:23:01 Chain 2 lost"),
+            ("2025-06-28", "09:23:01", "Chain 2 lost")
+        )
+    
+    def test_tab_separated_timestamp(self):
+        """Non-space whitespace is handled by the regex fallback"""
+        self.assertEqual(
+            DeviceHandler.split_timestamp("2025-06-28\t09:23:01\tChain 2 lost"),
+            ("2025-06-28", "09:23:01", "Chain 2 lost")
+        )
+    
+    def test_no_timestamp(self):
+        """Lines without a timestamp give None"""
+        self.assertIsNone(DeviceHandler.split_timestamp("Fan speed low"))
+        self.assertIsNone(DeviceHandler.split_timestamp("2025-06-28 Fan speed low"))
+        self.assertIsNone(DeviceHandler.split_timestamp(""))
+    
+    def test_matches_regex(self):
+        """The hand split agrees with the timestamp regex"""
+        lines = [
+            "2025-06-28 09:23:01 Fan speed low",
+            "2025-06-28 09:23:01 ",
+            "2025-6-28 09:23:01 Fan speed low",
+            "2025-06-28 9:23:01 Fan speed low",
+            "abcd-ef-gh ij:kl:mn Fan speed low",
+            "boot 2025-06-28 09:23:01 Fan speed low",
+        ]
+        for line in lines:
+            with self.subTest(line=line):
+                match = DeviceHandler._TIMESTAMP_RE.search(line)
+                expected = match.groups() if match else None
+                self.assertEqual(DeviceHandler.split_timestamp(line), expected)
+
+
+class TestTailLogLines(unittest.TestCase):
+    """Test case for extracting the last lines of a raw log"""
+    
+    def assert_matches_split(self, log_content: bytes, count: int):
+        text = log_content.decode("utf-8", "replace").strip()
+        expected = text.split("\n")[-count:] if text else []
+        self.assertEqual(DeviceHandler.tail_log_lines(log_content, count), expected)
+    
+    def test_last_line_by_default(self):
+        """Only the last line is returned by default"""
+        self.assertEqual(DeviceHandler.tail_log_lines(b"first\nsecond\nthird\n"), ["third"])
+    
+    def test_lines_oldest_first(self):
+        """Several lines are returned in log order"""
+        self.assertEqual(DeviceHandler.tail_log_lines(b"a\nb\nc\nd", 3), ["b", "c", "d"])
+    
+    def test_fewer_lines_than_requested(self):
+        """Short logs return all of their lines"""
+        self.assertEqual(DeviceHandler.tail_log_lines(b"a\nb", 10), ["a", "b"])
+    
+    def test_blank_leading_and_trailing_lines(self):
+        """Blank lines at either end of the log are not returned"""
+        self.assertEqual(DeviceHandler.tail_log_lines(b"\n\nlast", 10), ["last"])
+        self.assertEqual(DeviceHandler.tail_log_lines(b"  first\nlast\n\n", 10), ["first", "last"])
+    
+    def test_empty_log(self):
+        """Empty or whitespace-only logs give no lines"""
+        self.assertEqual(DeviceHandler.tail_log_lines(b""), [])
+        self.assertEqual(DeviceHandler.tail_log_lines(b" \n\n "), [])
+    
+    def test_invalid_utf8(self):
+        """Bytes that are not valid UTF-8 are replaced instead of raising"""
+        self.assertEqual(DeviceHandler.tail_log_lines(b"boot \xff junk\nNo 3 Fan find"), ["No 3 Fan find"])
+        self.assertEqual(DeviceHandler.tail_log_lines(b"a\nbad \xff", 1), ["bad �"])
+    
+    def test_matches_strip_split(self):
+        """The result matches decoding, stripping and splitting the whole log"""
+        logs = [b"a\n\nb\n", b"\n\nx\ny\n\nz\n", b"one", b"\r\nwin\r\nlines\r\n"]
+        for log_content in logs:
+            for count in (1, 2, 5):
+                with self.subTest(log_content=log_content, count=count):
+                    self.assert_matches_split(log_content, count)
+
+
+if __name__ == "__main__":
+    unittest.main()
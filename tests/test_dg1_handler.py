@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+import os
+import sys
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+# Add the parent directory to the path so we can import the modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from handlers.dg1_handler import DG1Handler
+
+
+def make_response(status_code: int, content: bytes, headers=None):
+    """Build a stand-in for a requests response"""
+    return SimpleNamespace(status_code=status_code, content=content, headers=headers or {})
+
+
+class TestDG1FetchLogs(unittest.TestCase):
+    """Test case for fetching the tail of a DG1+ log with a Range request"""
+    
+    def setUp(self):
+        scanner = SimpleNamespace(username="root", password="root", timeout=5)
+        self.handler = DG1Handler(scanner)
+    
+    def fetch_logs(self, *responses):
+        session = mock.Mock()
+        session.get.side_effect = list(responses)
+        with mock.patch("handlers.dg1_handler.get_session", return_value=session):
+            result = self.handler.fetch_logs("192.0.2.1")
+        return result, session
+    
+    def test_partial_response_drops_cut_first_line(self):
+        """A range starting mid-log drops its first, partial line"""
+        content = b"ed line\n2025-06-28 09:23:01 Fan ok\n2025-06-28 09:24:01 Chain 2 lost\n"
+        result, _ = self.fetch_logs(make_response(206, content, {"Content-Range": "bytes 1000-1063/1064"}))
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(result["logs"], ["2025-06-28 09:23:01 Fan ok", "2025-06-28 09:24:01 Chain 2 lost"])
+        self.assertEqual(result["message"], "Chain 2 lost")
+    
+    def test_partial_response_from_start_keeps_first_line(self):
+        """A short log returned whole as a 206 keeps its first line"""
+        content = b"2025-06-28 09:24:01 Chain 2 lost\n"
+        result, _ = self.fetch_logs(make_response(206, content, {"Content-Range": "bytes 0-33/34"}))
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(result["logs"], ["2025-06-28 09:24:01 Chain 2 lost"])
+        self.assertEqual(result["message"], "Chain 2 lost")
+    
+    def test_range_ignored(self):
+        """Devices that ignore the Range header return the whole log"""
+        content = b"2025-06-28 09:23:01 Fan ok\n2025-06-28 09:24:01 Chain 2 lost\n"
+        result, session = self.fetch_logs(make_response(200, content))
+        self.assertEqual(result["logs"], ["2025-06-28 09:23:01 Fan ok", "2025-06-28 09:24:01 Chain 2 lost"])
+        self.assertEqual(session.get.call_count, 1)
+    
+    def test_range_not_satisfiable_retries_without_range(self):
+        """A 416 is retried once without the Range header"""
+        content = b"2025-06-28 09:24:01 Chain 2 lost\n"
+        result, session = self.fetch_logs(make_response(416, b""), make_response(200, content))
+        self.assertEqual(result["message"], "Chain 2 lost")
+        self.assertEqual(session.get.call_count, 2)
+        self.assertNotIn("Range", session.get.call_args.kwargs["headers"])
+
+
+if __name__ == "__main__":
+    unittest.main()
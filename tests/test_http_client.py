@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+import os
+import sys
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+# Add the parent directory to the path so we can import the modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from http_client import SharedDigestAuth
+
+
+def make_digest_server(nonce: str) -> ThreadingHTTPServer:
+    """Start a local HTTP server that challenges any request not using its nonce"""
+    counts = {"401": 0, "200": 0}
+    counts_lock = threading.Lock()
+    
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        
+        def do_GET(self):
+            authorization = self.headers.get("Authorization", "")
+            if f'nonce="{nonce}"' not in authorization or 'username="root"' not in authorization:
+                with counts_lock:
+                    counts["401"] += 1
+                self.send_response(401)
+                self.send_header("WWW-Authenticate", f'Digest realm="miner", nonce="{nonce}", qop="auth"')
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+            else:
+                with counts_lock:
+                    counts["200"] += 1
+                body = b"ok"
+                self.send_response(200)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+        
+        def log_message(self, *args):
+            pass
+    
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    server.counts = counts
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class TestSharedDigestAuth(unittest.TestCase):
+    """Test case for sharing digest challenges between threads"""
+    
+    THREADS = 4
+    REQUESTS_PER_HOST = 25
+    
+    def setUp(self):
+        """Start two digest servers with different nonces"""
+        self.servers = [make_digest_server("nonce-a"), make_digest_server("nonce-b")]
+        self.urls = [f"http://127.0.0.1:{server.server_address[1]}/" for server in self.servers]
+    
+    def tearDown(self):
+        for server in self.servers:
+            server.shutdown()
+            server.server_close()
+    
+    def test_threads_share_challenge_per_host(self):
+        """Threads reuse each host's challenge instead of each being challenged"""
+        auth = SharedDigestAuth("root", "root")
+        session = requests.Session()
+        errors = []
+        
+        def worker():
+            try:
+                for _ in range(self.REQUESTS_PER_HOST):
+                    for url in self.urls:
+                        response = session.get(url, auth=auth, timeout=5)
+                        if response.status_code != 200:
+                            errors.append(response.status_code)
+            except Exception as e:
+                errors.append(e)
+        
+        threads = [threading.Thread(target=worker) for _ in range(self.THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        self.assertEqual(errors, [])
+        for server in self.servers:
+            # Every request succeeds; at most each thread's first request to a
+            # host is challenged before that host's nonce is shared
+            self.assertEqual(server.counts["200"], self.THREADS * self.REQUESTS_PER_HOST)
+            self.assertGreaterEqual(server.counts["401"], 1)
+            self.assertLessEqual(server.counts["401"], self.THREADS)
+    
+    def test_nonce_is_kept_per_host(self):
+        """Requests alternating between hosts each send that host's nonce"""
+        auth = SharedDigestAuth("root", "root")
+        session = requests.Session()
+        
+        for _ in range(3):
+            for url in self.urls:
+                self.assertEqual(session.get(url, auth=auth, timeout=5).status_code, 200)
+        
+        # One challenge per host, then its nonce is reused
+        self.assertEqual([server.counts["401"] for server in self.servers], [1, 1])
+        self.assertEqual([server.counts["200"] for server in self.servers], [3, 3])
+
+
+if __name__ == "__main__":
+    unittest.main()
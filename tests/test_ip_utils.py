@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+import os
+import sys
+import ipaddress
+import unittest
+from itertools import islice
+
+# Add the parent directory to the path so we can import the modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ip_utils import iter_network_hosts, network_hosts, network_size
+
+
+class TestNetworkSize(unittest.TestCase):
+    """Test case for counting network addresses from CIDR notation"""
+    
+    def test_matches_ipaddress(self):
+        """Counts agree with ipaddress.ip_network().num_addresses"""
+        for cidr in ["10.0.0.0/24", "10.0.0.0/16", "10.0.0.0/8", "10.0.0.0/31", "10.0.0.1/32",
+                     "0.0.0.0/0", "fe80::/64", "2001:db8::/126"]:
+            with self.subTest(cidr=cidr):
+                self.assertEqual(network_size(cidr), ipaddress.ip_network(cidr).num_addresses)
+    
+    def test_bare_address(self):
+        """An address without a prefix length counts as one"""
+        self.assertEqual(network_size("10.0.0.1"), 1)
+        self.assertEqual(network_size("fe80::1"), 1)
+
+
+class TestNetworkHosts(unittest.TestCase):
+    """Test case for expanding networks into host addresses"""
+    
+    def test_matches_ipaddress(self):
+        """Hosts agree with ipaddress hosts(), in order"""
+        for cidr in ["10.0.0.0/24", "192.168.1.0/30", "10.255.255.0/24", "172.16.0.0/20",
+                     "10.0.0.0/31", "10.0.0.5/32", "2001:db8::/126"]:
+            with self.subTest(cidr=cidr):
+                network = ipaddress.ip_network(cidr)
+                self.assertEqual(network_hosts(network), [str(ip) for ip in network.hosts()])
+    
+    def test_excludes_network_and_broadcast(self):
+        """The network and broadcast addresses are not hosts"""
+        hosts = network_hosts(ipaddress.ip_network("10.31.212.0/24"))
+        self.assertEqual(len(hosts), 254)
+        self.assertEqual(hosts[0], "10.31.212.1")
+        self.assertEqual(hosts[-1], "10.31.212.254")
+    
+    def test_iter_is_lazy(self):
+        """Hosts of a large network can be taken a slice at a time"""
+        hosts = iter_network_hosts(ipaddress.ip_network("10.0.0.0/8"))
+        self.assertEqual(list(islice(hosts, 3)), ["10.0.0.1", "10.0.0.2", "10.0.0.3"])
+        self.assertEqual(next(hosts), "10.0.0.4")
+    
+    def test_iter_matches_list(self):
+        """The iterator yields the same hosts as network_hosts()"""
+        for cidr in ["10.0.0.0/24", "10.0.0.0/31", "10.0.0.5/32", "2001:db8::/126"]:
+            with self.subTest(cidr=cidr):
+                network = ipaddress.ip_network(cidr)
+                self.assertEqual(list(iter_network_hosts(network)), network_hosts(network))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+import os
+import sys
+import socket
+import asyncio
+import threading
+import ipaddress
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+# Add the parent directory to the path so we can import the modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from subnet_scanner import SubnetScanner
+
+
+class ScannerTestCase(unittest.TestCase):
+    """Base test case with a scanner probing a loopback listener"""
+    
+    def setUp(self):
+        # Only 127.0.0.1 listens on the port, the other loopback hosts refuse
+        self.listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.listener.bind(("127.0.0.1", 0))
+        self.listener.listen(16)
+        self.addCleanup(self.listener.close)
+        
+        with mock.patch("builtins.print"):
+            self.scanner = SubnetScanner()
+        self.scanner.probe_port = self.listener.getsockname()[1]
+        self.scanner.timeout = 1
+        self.scanner.fetch_concurrency = 2
+
+
+class TestScanAsync(ScannerTestCase):
+    """Test case for the TCP sweep of a network"""
+    
+    def test_finds_listening_host(self):
+        """Only hosts accepting connections on the probe port are responsive"""
+        found = []
+        
+        async def on_found(ip):
+            found.append(ip)
+        
+        network = ipaddress.ip_network("127.0.0.0/29")
+        responsive = asyncio.run(self.scanner._scan_async(network, verbose=False, on_found=on_found))
+        self.assertEqual(responsive, ["127.0.0.1"])
+        self.assertEqual(found, ["127.0.0.1"])
+    
+    def test_chunks_after_warmup(self):
+        """Hosts past the warm-up batch are probed in chunks"""
+        self.scanner.scan_warmup_size = 1
+        self.scanner.scan_chunk_size = 2
+        network = ipaddress.ip_network("127.0.0.0/29")
+        with mock.patch("subnet_scanner.asyncio.open_connection", side_effect=ConnectionRefusedError) as connect:
+            responsive = asyncio.run(self.scanner._scan_async(network, verbose=False))
+        self.assertEqual(responsive, [])
+        self.assertEqual([call.args[0] for call in connect.call_args_list],
+                         [f"127.0.0.{host}" for host in range(1, 7)])
+
+
+class TestScanAndCollect(ScannerTestCase):
+    """Test case for the sweep and collection pipeline"""
+    
+    def setUp(self):
+        super().setUp()
+        self.collected = []
+        
+        def collect_device(ip, known_type=None):
+            self.collected.append((ip, known_type))
+            return {"ip": ip, "status": "success", "device_type": known_type or "unknown"}
+        
+        self.scanner._collect_device = collect_device
+    
+    def scan_and_collect(self, subnets):
+        with mock.patch("builtins.print"):
+            return asyncio.run(self.scanner._scan_and_collect_async(subnets))
+    
+    def test_collects_responsive_hosts(self):
+        """Each responsive IP is collected and reported"""
+        ips, results = self.scan_and_collect(["127.0.0.0/30"])
+        self.assertEqual(ips, ["127.0.0.1"])
+        self.assertEqual(list(results), ["127.0.0.1"])
+        self.assertEqual(self.collected, [("127.0.0.1", None)])
+    
+    def test_configured_device_type(self):
+        """Subnets with a configured device type hand it to the collection"""
+        self.scanner.config["device_types"] = {"127.0.0.0/30": "T21"}
+        ips, results = self.scan_and_collect(["127.0.0.0/30"])
+        self.assertEqual(results["127.0.0.1"]["device_type"], "T21")
+        self.assertEqual(self.collected, [("127.0.0.1", "T21")])
+    
+    def test_unknown_configured_device_type(self):
+        """Device types without a registered handler fall back to detection"""
+        self.scanner.config["device_types"] = {"127.0.0.0/30": "Toaster"}
+        self.scan_and_collect(["127.0.0.0/30"])
+        self.assertEqual(self.collected, [("127.0.0.1", None)])
+    
+    def test_overlapping_subnets(self):
+        """An IP found by several subnets is collected and reported once"""
+        ips, results = self.scan_and_collect(["127.0.0.0/30", "127.0.0.0/29", "127.0.0.0/30"])
+        self.assertEqual(ips, ["127.0.0.1"])
+        self.assertEqual(list(results), ["127.0.0.1"])
+        self.assertEqual(self.collected, [("127.0.0.1", None)])
+    
+    def test_invalid_subnet(self):
+        """Invalid subnets are skipped"""
+        ips, results = self.scan_and_collect(["not-a-subnet", "127.0.0.0/30"])
+        self.assertEqual(ips, ["127.0.0.1"])
+
+
+class TestFetchWorker(ScannerTestCase):
+    """Test case for the fetch workers and their device timeout"""
+    
+    def run_worker(self, ips, workers=1):
+        queue = asyncio.Queue()
+        for ip in ips:
+            queue.put_nowait((ip, None))
+        outcomes = {}
+        executor = ThreadPoolExecutor(max_workers=workers)
+        
+        async def run():
+            for _ in range(workers):
+                queue.put_nowait(None)
+            await asyncio.gather(*[self.scanner._fetch_worker(queue, executor, outcomes)
+                                   for _ in range(workers)])
+        
+        try:
+            asyncio.run(run())
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        return outcomes
+    
+    def test_results_and_errors(self):
+        """Results and handler exceptions are both recorded"""
+        def collect_device(ip, known_type=None):
+            if ip == "10.0.0.2":
+                raise ValueError("bad device")
+            return {"ip": ip, "status": "success"}
+        
+        self.scanner._collect_device = collect_device
+        outcomes = self.run_worker(["10.0.0.1", "10.0.0.2"])
+        self.assertEqual(outcomes["10.0.0.1"], {"ip": "10.0.0.1", "status": "success"})
+        self.assertIsInstance(outcomes["10.0.0.2"], ValueError)
+    
+    def test_device_timeout(self):
+        """A stuck device times out, and devices left without a free thread do too"""
+        release = threading.Event()
+        self.addCleanup(release.set)
+        
+        def collect_device(ip, known_type=None):
+            if ip == "10.0.0.1":
+                release.wait(5)
+            return {"ip": ip, "status": "success"}
+        
+        self.scanner._collect_device = collect_device
+        self.scanner.device_timeout = 0.2
+        outcomes = self.run_worker(["10.0.0.1", "10.0.0.2"])
+        self.assertIsInstance(outcomes["10.0.0.1"], asyncio.TimeoutError)
+        self.assertIsInstance(outcomes["10.0.0.2"], RuntimeError)
+        self.assertIn("No free worker thread", str(outcomes["10.0.0.2"]))
+    
+    def test_timeout_starts_with_handler(self):
+        """Time spent waiting for a busy thread does not count against a device"""
+        release = threading.Event()
+        self.addCleanup(release.set)
+        
+        def collect_device(ip, known_type=None):
+            if ip == "10.0.0.1":
+                release.wait(0.45)
+            return {"ip": ip, "status": "success"}
+        
+        self.scanner._collect_device = collect_device
+        self.scanner.device_timeout = 0.3
+        outcomes = self.run_worker(["10.0.0.1", "10.0.0.2"])
+        self.assertIsInstance(outcomes["10.0.0.1"], asyncio.TimeoutError)
+        self.assertEqual(outcomes["10.0.0.2"], {"ip": "10.0.0.2", "status": "success"})
+
+
+class TestCollectDevice(ScannerTestCase):
+    """Test case for detecting and fetching a single device"""
+    
+    def setUp(self):
+        super().setUp()
+        self.scanner.device_manager = mock.Mock()
+        self.scanner.device_manager.detect_device_type.return_value = {
+            "device_type": "S21", "device_type_source": "registry"}
+        self.scanner.device_manager.fetch_logs_from_device.side_effect = lambda ip, device_type, verbose: {
+            "ip": ip, "status": "success", "message": "Fan speed low"}
+    
+    def test_configured_type_skips_detection(self):
+        """A configured device type is used without running detection"""
+        result = self.scanner._collect_device("10.0.0.1", "T21")
+        self.scanner.device_manager.detect_device_type.assert_not_called()
+        self.scanner.device_manager.fetch_logs_from_device.assert_called_once_with("10.0.0.1", "T21", verbose=False)
+        self.assertEqual(result["device_type"], "T21")
+        self.assertEqual(result["device_type_source"], "config")
+    
+    def test_detected_type(self):
+        """Without a configured type the device type is detected"""
+        result = self.scanner._collect_device("10.0.0.1")
+        self.scanner.device_manager.detect_device_type.assert_called_once_with("10.0.0.1", verbose=False)
+        self.assertEqual(result["device_type"], "S21")
+        self.assertEqual(result["device_type_source"], "registry")
+
+
+class TestResultsFromOutcomes(ScannerTestCase):
+    """Test case for turning collected outcomes into log results"""
+    
+    def test_outcomes(self):
+        """Results keep the IP order; errors are reported and empty results dropped"""
+        self.scanner.device_timeout = 7
+        ips = ["10.0.0.4", "10.0.0.1", "10.0.0.3", "10.0.0.2", "10.0.0.5"]
+        outcomes = {
+            "10.0.0.1": {"ip": "10.0.0.1", "status": "success"},
+            "10.0.0.2": asyncio.TimeoutError(),
+            "10.0.0.3": ValueError("bad device"),
+            "10.0.0.4": None,
+        }
+        results = self.scanner._results_from_outcomes(ips, outcomes)
+        self.assertEqual(list(results), ["10.0.0.1", "10.0.0.3", "10.0.0.2"])
+        self.assertEqual(results["10.0.0.1"], {"ip": "10.0.0.1", "status": "success"})
+        self.assertEqual(results["10.0.0.2"]["message"], "Timed out after 7 seconds")
+        self.assertEqual(results["10.0.0.3"]["message"], "Error: bad device")
+    
+    def test_duplicate_empty_result(self):
+        """An IP listed twice with an empty result does not raise"""
+        results = self.scanner._results_from_outcomes(["10.0.0.1", "10.0.0.1"], {"10.0.0.1": None})
+        self.assertEqual(results, {})
+
+
+if __name__ == "__main__":
+    unittest.main()